@@ -5,27 +5,42 @@ Professional web application with Google Sheets integration
 
 import streamlit as st
 import pandas as pd
-import json
+import numpy as np
+import copy
+import functools
 import math
 from datetime import datetime
 from dataclasses import dataclass
 import io
 
-# Google Sheets (optional - will work without it)
-try:
-    import gspread
-    from google.oauth2.service_account import Credentials
-    SHEETS_OK = True
-except:
-    SHEETS_OK = False
+# Google Sheets (optional - will work without it); imported lazily on
+# first use like the Excel backend
+@functools.lru_cache(maxsize=None)
+def sheets_ok():
+    try:
+        import gspread  # noqa: F401
+        from google.oauth2.service_account import Credentials  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+# Excel export (optional) - imported lazily on first use so cold start
+# does not pay for it
+@functools.lru_cache(maxsize=None)
+def excel_ok():
+    try:
+        import openpyxl  # noqa: F401
+        return True
+    except ImportError:
+        return False
 
-# Excel export (optional)
+# Numba JIT (optional - falls back to plain NumPy); needed at module
+# scope to decorate the kernel, so this one stays eager
 try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill
-    EXCEL_OK = True
-except:
-    EXCEL_OK = False
+    import numba as nb
+    NUMBA_OK = True
+except ImportError:
+    NUMBA_OK = False
 
 # Page setup
 st.set_page_config(
@@ -35,7 +50,7 @@ st.set_page_config(
 )
 
 # CSS Styling
-st.markdown("""
+_CSS = """
 <style>
     .main {background-color: #f8f9fa;}
     .stButton button {
@@ -49,7 +64,8 @@ st.markdown("""
     h1 {color: #1e3a8a;}
     h2 {color: #3b82f6;}
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # Component data
 @dataclass
@@ -60,142 +76,479 @@ class Component:
     lhv: float
     hhv: float
 
-COMPONENTS = {
-    'Methane': Component('Methane', 'CH4', 16.043, 50.01, 55.50),
-    'Ethane': Component('Ethane', 'C2H6', 30.070, 47.49, 51.88),
-    'Propane': Component('Propane', 'C3H8', 44.097, 46.35, 50.36),
-    'n-Butane': Component('n-Butane', 'C4H10', 58.123, 45.75, 49.50),
-    'i-Butane': Component('i-Butane', 'C4H10', 58.123, 45.61, 49.36),
-    'n-Pentane': Component('n-Pentane', 'C5H12', 72.150, 45.36, 49.01),
-    'i-Pentane': Component('i-Pentane', 'C5H12', 72.150, 45.24, 48.89),
-    'n-Hexane': Component('n-Hexane', 'C6H14', 86.177, 45.10, 48.68),
-    'Heptane': Component('Heptane', 'C7H16', 100.204, 44.93, 48.45),
-    'Hydrogen': Component('Hydrogen', 'H2', 2.016, 120.00, 141.80),
-    'Carbon Monoxide': Component('Carbon Monoxide', 'CO', 28.010, 10.10, 10.10),
-    'Carbon Dioxide': Component('Carbon Dioxide', 'CO2', 44.010, 0.00, 0.00),
-    'Nitrogen': Component('Nitrogen', 'N2', 28.014, 0.00, 0.00),
-    'Hydrogen Sulfide': Component('Hydrogen Sulfide', 'H2S', 34.081, 15.20, 16.53),
-}
+@st.cache_resource
+def _static_data():
+    """Build the static component/preset/limit tables and SoA arrays once per process"""
+    components = {
+        'Methane': Component('Methane', 'CH4', 16.043, 50.01, 55.50),
+        'Ethane': Component('Ethane', 'C2H6', 30.070, 47.49, 51.88),
+        'Propane': Component('Propane', 'C3H8', 44.097, 46.35, 50.36),
+        'n-Butane': Component('n-Butane', 'C4H10', 58.123, 45.75, 49.50),
+        'i-Butane': Component('i-Butane', 'C4H10', 58.123, 45.61, 49.36),
+        'n-Pentane': Component('n-Pentane', 'C5H12', 72.150, 45.36, 49.01),
+        'i-Pentane': Component('i-Pentane', 'C5H12', 72.150, 45.24, 48.89),
+        'n-Hexane': Component('n-Hexane', 'C6H14', 86.177, 45.10, 48.68),
+        'Heptane': Component('Heptane', 'C7H16', 100.204, 44.93, 48.45),
+        'Hydrogen': Component('Hydrogen', 'H2', 2.016, 120.00, 141.80),
+        'Carbon Monoxide': Component('Carbon Monoxide', 'CO', 28.010, 10.10, 10.10),
+        'Carbon Dioxide': Component('Carbon Dioxide', 'CO2', 44.010, 0.00, 0.00),
+        'Nitrogen': Component('Nitrogen', 'N2', 28.014, 0.00, 0.00),
+        'Hydrogen Sulfide': Component('Hydrogen Sulfide', 'H2S', 34.081, 15.20, 16.53),
+    }
 
-PRESETS = {
-    'Pipeline Natural Gas': {
-        'Methane': 95.0, 'Ethane': 2.5, 'Propane': 0.5, 
-        'n-Butane': 0.2, 'Carbon Dioxide': 1.0, 'Nitrogen': 0.8
-    },
-    'Rich Natural Gas': {
-        'Methane': 85.0, 'Ethane': 8.0, 'Propane': 4.0,
-        'n-Butane': 1.5, 'Carbon Dioxide': 0.5, 'Nitrogen': 1.0
-    },
-    'Lean Natural Gas': {
-        'Methane': 98.0, 'Ethane': 0.5, 
-        'Carbon Dioxide': 1.0, 'Nitrogen': 0.5
-    },
-}
+    # SoA arrays for the calculation kernel
+    names = list(components.keys())
+    name_to_idx = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    mw_arr = np.fromiter((c.mw for c in components.values()), dtype=np.float64, count=n)
+    lhv_arr = np.fromiter((c.lhv for c in components.values()), dtype=np.float64, count=n)
+    hhv_arr = np.fromiter((c.hhv for c in components.values()), dtype=np.float64, count=n)
+
+    # Methane Number coefficients aligned with the component order
+    mn_coef = np.zeros(n)
+    mn_coef[name_to_idx['Methane']] = 137.78
+    mn_coef[name_to_idx['Ethane']] = -40.0
+    mn_coef[name_to_idx['Propane']] = -79.52
+
+    # Stoichiometric O2 demand and flame speed index coefficients
+    o2_coef = np.zeros(n)
+    o2_coef[name_to_idx['Methane']] = 2.0
+    o2_coef[name_to_idx['Ethane']] = 3.5
+    o2_coef[name_to_idx['Propane']] = 5.0
+    o2_coef[name_to_idx['Hydrogen']] = 0.5
+
+    fsi_coef = np.zeros(n)
+    fsi_coef[name_to_idx['Methane']] = 1.0
+    fsi_coef[name_to_idx['Ethane']] = 0.9
+
+    presets = {
+        'Pipeline Natural Gas': {
+            'Methane': 95.0, 'Ethane': 2.5, 'Propane': 0.5,
+            'n-Butane': 0.2, 'Carbon Dioxide': 1.0, 'Nitrogen': 0.8
+        },
+        'Rich Natural Gas': {
+            'Methane': 85.0, 'Ethane': 8.0, 'Propane': 4.0,
+            'n-Butane': 1.5, 'Carbon Dioxide': 0.5, 'Nitrogen': 1.0
+        },
+        'Lean Natural Gas': {
+            'Methane': 98.0, 'Ethane': 0.5,
+            'Carbon Dioxide': 1.0, 'Nitrogen': 0.5
+        },
+    }
+
+    default_limits = {
+        'wobbe_lower': {'min': 47, 'max': 51, 'name': 'Wobbe Index (L)'},
+        'lhv_vol': {'min': 32, 'max': 40, 'name': 'LHV (volume)'},
+        'sg': {'min': 0.55, 'max': 0.75, 'name': 'Specific Gravity'},
+        'mn': {'min': 80, 'max': 999, 'name': 'Methane Number'},
+        'h2': {'min': 0, 'max': 5, 'name': 'H2 Content'},
+        'co2_n2': {'min': 0, 'max': 10, 'name': 'Inerts'},
+        'h2s': {'min': 0, 'max': 5, 'name': 'H2S Content'},
+    }
+
+    # Presets as ready-to-copy fraction arrays aligned with the component order
+    preset_arrays = {}
+    for preset_name, comp in presets.items():
+        arr = np.zeros(n)
+        for comp_name, value in comp.items():
+            arr[name_to_idx[comp_name]] = value
+        preset_arrays[preset_name] = arr
+
+    return {
+        'components': components,
+        'presets': presets,
+        'preset_arrays': preset_arrays,
+        'default_limits': default_limits,
+        'names': names,
+        'name_to_idx': name_to_idx,
+        'names_arr': np.array(names),
+        'formulas_arr': np.array([c.formula for c in components.values()]),
+        # All per-component reductions stacked into one constant matrix so
+        # the kernel is a single matrix-vector product
+        'prop_mat': np.ascontiguousarray(np.vstack((
+            mw_arr, mw_arr * lhv_arr, mw_arr * hhv_arr,
+            mn_coef, o2_coef, fsi_coef,
+        ))),
+    }
+
+_S = _static_data()
+COMPONENTS = _S['components']
+PRESETS = _S['presets']
+_PRESET_ARRAYS = _S['preset_arrays']
+DEFAULT_LIMITS = _S['default_limits']
+COMP_NAMES = _S['names']
+NAME_TO_IDX = _S['name_to_idx']
+N_COMP = len(COMP_NAMES)
+COMP_NAMES_ARR = _S['names_arr']
+COMP_FORMULAS = _S['formulas_arr']
+PROP_MAT = _S['prop_mat']
+
+IDX_HYDROGEN = NAME_TO_IDX['Hydrogen']
+IDX_CO2 = NAME_TO_IDX['Carbon Dioxide']
+IDX_N2 = NAME_TO_IDX['Nitrogen']
+IDX_H2S = NAME_TO_IDX['Hydrogen Sulfide']
+
+# Reference-condition and unit-conversion magnitudes, resolved once at
+# import so the hot path only ever multiplies by a plain float
+MW_AIR = 28.97            # kg/kmol
+MOLAR_VOL = 22.414        # m3/kmol
+SCF_PER_LBMOL = 379.49    # scf/lb-mol
+MJM3_TO_BTUSCF = 26.839
+MJKG_TO_BTULB = 429.923
+_INV_MW_AIR = 1.0 / MW_AIR
+_INV_MOLAR_VOL = 1.0 / MOLAR_VOL
+
+# Wobbe = lhv_v / sqrt(sg) = lhv_m * sqrt(mw) * sqrt(MW_AIR) / MOLAR_VOL
+_WOBBE_K = math.sqrt(MW_AIR) / MOLAR_VOL
+
+def _kernel(x, prop_mat):
+    """Numeric core: all weighted sums as one matrix-vector product"""
+    totals = prop_mat @ x
+    mw = totals[0]
+    return mw, totals[1] / mw, totals[2] / mw, totals[3], totals[4], totals[5]
+
+if NUMBA_OK:
+    # Explicit-loop variant: LLVM vectorizes it without needing scipy BLAS
+    @nb.njit(cache=True, fastmath=True)
+    def _kernel(x, prop_mat):
+        mw = 0.0
+        num_lhv = 0.0
+        num_hhv = 0.0
+        mn_base = 0.0
+        o2 = 0.0
+        fsi = 0.0
+        for i in range(x.shape[0]):
+            f = x[i]
+            mw += f * prop_mat[0, i]
+            num_lhv += f * prop_mat[1, i]
+            num_hhv += f * prop_mat[2, i]
+            mn_base += f * prop_mat[3, i]
+            o2 += f * prop_mat[4, i]
+            fsi += f * prop_mat[5, i]
+        return mw, num_lhv / mw, num_hhv / mw, mn_base, o2, fsi
+
+# Elementwise property formulas, exposed as ufuncs so batch what-if
+# sweeps over composition arrays run without Python loops
+def mn_ufunc(methane, ethane, propane, co2, n2):
+    return 137.78 * methane - 40.0 * ethane - 79.52 * propane + 1.5 * (co2 + n2)
+
+def aft_ufunc(lhv_v_si, co2_n2):
+    return 1900.0 + (lhv_v_si / 40.0) * 100.0 - co2_n2 * 15.0
+
+def afr_ufunc(methane, ethane, propane, hydrogen, mw):
+    o2 = methane * 2.0 + ethane * 3.5 + propane * 5.0 + hydrogen * 0.5
+    return (o2 / 0.2095 * 28.97) / mw
+
+if NUMBA_OK:
+    mn_ufunc = nb.vectorize(['f8(f8,f8,f8,f8,f8)'], cache=True)(mn_ufunc)
+    aft_ufunc = nb.vectorize(['f8(f8,f8)'], cache=True)(aft_ufunc)
+    afr_ufunc = nb.vectorize(['f8(f8,f8,f8,f8,f8)'], cache=True)(afr_ufunc)
+
+@st.cache_resource
+def _warm_kernel():
+    """Trigger JIT compilation at startup so the first calculation is fast"""
+    dummy = np.zeros(N_COMP)
+    dummy[0] = 1.0
+    _kernel(dummy, PROP_MAT)
+    return True
+
+_warm_kernel()
+
+# Limit keys checked in the Summary tab, paired with their result keys
+CHECK_KEYS = ('wobbe_lower', 'lhv_vol', 'sg', 'mn', 'h2', 'co2_n2')
+RES_KEYS = ('wi_l_si', 'lhv_v_si', 'sg', 'mn', 'h2', 'co2_n2')
 
-DEFAULT_LIMITS = {
-    'wobbe_lower': {'min': 47, 'max': 51, 'name': 'Wobbe Index (L)'},
-    'lhv_vol': {'min': 32, 'max': 40, 'name': 'LHV (volume)'},
-    'sg': {'min': 0.55, 'max': 0.75, 'name': 'Specific Gravity'},
-    'mn': {'min': 80, 'max': 999, 'name': 'Methane Number'},
-    'h2': {'min': 0, 'max': 5, 'name': 'H2 Content'},
-    'co2_n2': {'min': 0, 'max': 10, 'name': 'Inerts'},
-    'h2s': {'min': 0, 'max': 5, 'name': 'H2S Content'},
+# Per-limit display dispatch: (convert_for_display key or None,
+# SI unit, US unit, SI->US factor applied to the limit range)
+UNIT_INFO = {
+    'wobbe_lower': ('wi_l', 'MJ/m3', 'Btu/scf', MJM3_TO_BTUSCF),
+    'lhv_vol': ('lhv_v', 'MJ/m3', 'Btu/scf', MJM3_TO_BTUSCF),
+    'sg': (None, '-', '-', 1.0),
+    'mn': (None, '-', '-', 1.0),
+    'h2': (None, 'mol%', 'mol%', 1.0),
+    'co2_n2': (None, 'mol%', 'mol%', 1.0),
+    'h2s': (None, 'ppmv', 'ppmv', 1.0),
 }
 
 # Session state
 if 'composition' not in st.session_state:
-    st.session_state.composition = {name: 0.0 for name in COMPONENTS.keys()}
+    st.session_state.composition = np.zeros(N_COMP)
 if 'results' not in st.session_state:
     st.session_state.results = {}
 if 'use_si' not in st.session_state:
     st.session_state.use_si = True
 if 'limits' not in st.session_state:
-    st.session_state.limits = DEFAULT_LIMITS.copy()
+    # Deep copy: the Settings tab mutates the inner dicts in place, and the
+    # cached defaults must never see those edits
+    st.session_state.limits = copy.deepcopy(DEFAULT_LIMITS)
 
 # Callback functions for preset loading
 def load_preset_callback():
     """Load selected preset into composition"""
     selected = st.session_state.get('preset_selector', 'Custom')
     if selected != 'Custom':
-        # Clear all first
-        for name in COMPONENTS.keys():
-            st.session_state.composition[name] = 0.0
-        # Load preset
-        for name, value in PRESETS[selected].items():
-            st.session_state.composition[name] = value
+        st.session_state.composition = _PRESET_ARRAYS[selected].copy()
 
 def clear_all_callback():
     """Clear all composition values"""
-    for name in COMPONENTS.keys():
-        st.session_state.composition[name] = 0.0
+    st.session_state.composition = np.zeros(N_COMP)
+
+@dataclass(slots=True, frozen=True)
+class Results:
+    composition: dict
+    x: np.ndarray
+    order: np.ndarray
+    mw: float
+    sg: float
+    dens_si: float
+    lhv_m_si: float
+    lhv_v_si: float
+    hhv_m_si: float
+    hhv_v_si: float
+    wi_l_si: float
+    wi_h_si: float
+    h2: float
+    co2_n2: float
+    h2s: float
+    mn: float
+    afr: float
+    aft_c: float
+    lel: float
+    fsi: float
+
+@functools.lru_cache(maxsize=256)
+def _calc_cached(comp_tuple):
+    """Memoized calculation core, keyed on an immutable (name, mol%) tuple.
+
+    Results is frozen, so handing the same instance to every caller is safe
+    and avoids the pickle round-trip st.cache_data would pay on each hit.
+    """
+    # Scatter mol% into a fixed-order fraction vector, accumulating the
+    # normalization total and the nonzero indices in the same pass
+    x = np.zeros(N_COMP)
+    idx = np.empty(len(comp_tuple), dtype=np.intp)
+    total = 0.0
+    for j, (name, value) in enumerate(comp_tuple):
+        i = NAME_TO_IDX[name]
+        idx[j] = i
+        x[i] = value
+        total += value
+    x /= total
+
+    if len(idx) < N_COMP:
+        # Sparse fast path: comp_tuple holds only the nonzero species, so
+        # reduce over just those columns (typical gases fill 6-8 of 14)
+        mw, lhv_m_si, hhv_m_si, mn_base, o2, fsi = _kernel(
+            x[idx], np.ascontiguousarray(PROP_MAT[:, idx]))
+    else:
+        mw, lhv_m_si, hhv_m_si, mn_base, o2, fsi = _kernel(x, PROP_MAT)
+    mw = float(mw)
+    lhv_m_si = float(lhv_m_si)
+    hhv_m_si = float(hhv_m_si)
 
-def calculate_properties(comp_percent):
-    """Calculate all gas properties from composition"""
-    comp = {k: v/100 for k, v in comp_percent.items() if v > 0}
-    
-    if not comp:
-        return None
-    
-    total = sum(comp.values())
-    comp = {k: v/total for k, v in comp.items()}
-    
     # Basic properties
-    mw = sum(comp[n] * COMPONENTS[n].mw for n in comp)
-    sg = mw / 28.97
-    dens_si = mw / 22.414
-    dens_us = mw / 379.49
-    
+    sg = mw * _INV_MW_AIR
+    dens_si = mw * _INV_MOLAR_VOL
+
     # Heating values
-    lhv_m_si = sum((comp[n] * COMPONENTS[n].mw / mw) * COMPONENTS[n].lhv for n in comp)
-    hhv_m_si = sum((comp[n] * COMPONENTS[n].mw / mw) * COMPONENTS[n].hhv for n in comp)
     lhv_v_si = lhv_m_si * dens_si
     hhv_v_si = hhv_m_si * dens_si
-    
-    # Wobbe Index
-    wi_l_si = lhv_v_si / math.sqrt(sg)
-    wi_h_si = hhv_v_si / math.sqrt(sg)
-    
+
+    # Wobbe Index (algebraically fused: one sqrt, no divisions)
+    sqrt_mw = math.sqrt(mw)
+    wi_l_si = lhv_m_si * sqrt_mw * _WOBBE_K
+    wi_h_si = hhv_m_si * sqrt_mw * _WOBBE_K
+
     # Advanced properties
-    h2 = comp.get('Hydrogen', 0) * 100
-    co2_n2 = (comp.get('Carbon Dioxide', 0) + comp.get('Nitrogen', 0)) * 100
-    h2s = comp.get('Hydrogen Sulfide', 0) * 1e6
-    
-    mn = (137.78 * comp.get('Methane', 0) - 
-          40 * comp.get('Ethane', 0) - 
-          79.52 * comp.get('Propane', 0) + 
-          1.5 * co2_n2/100)
-    
-    o2 = (comp.get('Methane', 0) * 2 + 
-          comp.get('Ethane', 0) * 3.5 + 
-          comp.get('Propane', 0) * 5 + 
-          comp.get('Hydrogen', 0) * 0.5)
-    afr = (o2 / 0.2095 * 28.97) / mw
-    
-    aft_c = 1900 + (lhv_v_si / 40) * 100 - (co2_n2 * 15)
-    aft_f = aft_c * 1.8 + 32
-    
-    lel = 0
-    fsi = comp.get('Methane', 0) * 1.0 + comp.get('Ethane', 0) * 0.9
-    
+    h2 = float(x[IDX_HYDROGEN] * 100)
+    co2_n2 = float((x[IDX_CO2] + x[IDX_N2]) * 100)
+    h2s = float(x[IDX_H2S] * 1e6)
+
+    mn = float(mn_base) + 1.5 * co2_n2/100
+
+    afr = (float(o2) / 0.2095 * MW_AIR) / mw
+
+    aft_c = float(aft_ufunc(lhv_v_si, co2_n2))
+
+    lel = 0.0
+    fsi = float(fsi)
+
+    comp = {COMP_NAMES[i]: float(x[i]) for i in np.nonzero(x)[0]}
+
+    return Results(
+        composition=comp,
+        x=x,
+        order=np.argsort(-x),
+        mw=mw, sg=sg, dens_si=dens_si,
+        lhv_m_si=lhv_m_si, lhv_v_si=lhv_v_si,
+        hhv_m_si=hhv_m_si, hhv_v_si=hhv_v_si,
+        wi_l_si=wi_l_si, wi_h_si=wi_h_si,
+        h2=h2, co2_n2=co2_n2, h2s=h2s, mn=mn,
+        afr=afr, aft_c=aft_c, lel=lel, fsi=fsi
+    )
+
+def _comp_key(comp_percent):
+    """Canonical hashable key for a composition dict.
+
+    Rounding keeps FP noise from causing spurious cache misses.
+    """
+    return tuple(sorted(
+        (k, round(v, 6)) for k, v in comp_percent.items() if v > 0
+    ))
+
+def calculate_properties(comp_percent):
+    """Calculate all gas properties from composition"""
+    comp_tuple = _comp_key(comp_percent)
+    if not comp_tuple:
+        return None
+    return _calc_cached(comp_tuple)
+
+# SI -> US conversion as one fused multiply-add, aligned with
+# [dens, lhv_m, hhv_m, wi_l, wi_h, aft]; dens uses MOLAR_VOL/SCF_PER_LBMOL
+# so that dens_si * factor lands on mw / SCF_PER_LBMOL
+_US_FACTORS = np.array([MOLAR_VOL / SCF_PER_LBMOL, MJKG_TO_BTULB, MJKG_TO_BTULB,
+                        MJM3_TO_BTUSCF, MJM3_TO_BTUSCF, 1.8])
+_US_OFFSETS = np.array([0.0, 0.0, 0.0, 0.0, 0.0, 32.0])
+
+def convert_for_display(r, si):
+    """Pick display units for a result; the cached results stay SI-only"""
+    if si:
+        return {
+            'dens': r.dens_si,
+            'lhv_m': r.lhv_m_si, 'lhv_v': r.lhv_v_si,
+            'hhv_m': r.hhv_m_si, 'hhv_v': r.hhv_v_si,
+            'wi_l': r.wi_l_si, 'wi_h': r.wi_h_si,
+            'aft': r.aft_c,
+        }
+    si_vals = np.array([r.dens_si, r.lhv_m_si, r.hhv_m_si,
+                        r.wi_l_si, r.wi_h_si, r.aft_c])
+    dens, lhv_m, hhv_m, wi_l, wi_h, aft = si_vals * _US_FACTORS + _US_OFFSETS
+    return {
+        'dens': dens,
+        'lhv_m': lhv_m,
+        'lhv_v': lhv_m * dens,
+        'hhv_m': hhv_m,
+        'hhv_v': hhv_m * dens,
+        'wi_l': wi_l,
+        'wi_h': wi_h,
+        'aft': aft,
+    }
+
+@st.cache_resource
+def _excel_styles():
+    """Construct shared openpyxl style objects once per process"""
+    from openpyxl.styles import Font
+
     return {
-        'composition': comp,
-        'mw': mw, 'sg': sg, 'dens_si': dens_si, 'dens_us': dens_us,
-        'lhv_m_si': lhv_m_si, 'lhv_v_si': lhv_v_si,
-        'lhv_m_us': lhv_m_si * 429.923, 'lhv_v_us': lhv_m_si * 429.923 * dens_us,
-        'hhv_m_si': hhv_m_si, 'hhv_v_si': hhv_v_si,
-        'hhv_m_us': hhv_m_si * 429.923, 'hhv_v_us': hhv_m_si * 429.923 * dens_us,
-        'wi_l_si': wi_l_si, 'wi_h_si': wi_h_si,
-        'wi_l_us': wi_l_si * 26.839, 'wi_h_us': wi_h_si * 26.839,
-        'h2': h2, 'co2_n2': co2_n2, 'h2s': h2s, 'mn': mn, 
-        'afr': afr, 'aft_c': aft_c, 'aft_f': aft_f, 'lel': lel, 'fsi': fsi
+        'title': Font(bold=True, size=14),
+        'header': Font(bold=True),
     }
 
-def check_status(key, value, limits):
-    """Check if value is within limits"""
-    if key not in limits:
-        return '-'
-    lim = limits[key]
-    return 'OK' if lim['min'] <= value <= lim['max'] else 'FAIL'
+@st.cache_data
+def _build_excel(props_tuple, project, date_str):
+    """Serialize the report workbook once per unique (props, project, date)"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    output = io.BytesIO()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Report")
+
+    styles = _excel_styles()
+    title = WriteOnlyCell(ws, value="Gas Analysis Report")
+    title.font = styles['title']
+    ws.append([title])
+    ws.append([])
+    ws.append([f"Project: {project}"])
+    ws.append([f"Date: {date_str}"])
+    ws.append([])
+    header = []
+    for label in ("Property", "Value", "Unit"):
+        cell = WriteOnlyCell(ws, value=label)
+        cell.font = styles['header']
+        header.append(cell)
+    ws.append(header)
+    for prop in props_tuple:
+        ws.append(list(prop))
+
+    wb.save(output)
+    return output.getvalue()
+
+# Static columns of the properties table; values are formatted in one
+# np.char.mod call with per-row precision
+_PROPS_LABELS = (
+    'Molecular Weight', 'Specific Gravity', 'Density',
+    'LHV (mass)', 'LHV (volume)', 'HHV (mass)', 'HHV (volume)',
+    'Wobbe Index (L)', 'Wobbe Index (H)',
+    'H2 Content', 'CO2+N2', 'H2S', 'Methane Number',
+    'Air/Fuel Ratio', 'Flame Temp',
+)
+_PROPS_FMTS = np.array([
+    '%.3f', '%.4f', '%.4f',
+    '%.2f', '%.2f', '%.2f', '%.2f',
+    '%.2f', '%.2f',
+    '%.2f', '%.2f', '%.1f', '%.1f',
+    '%.2f', '%.0f',
+])
+_PROPS_UNITS_SI = (
+    'g/mol', '-', 'kg/m3',
+    'MJ/kg', 'MJ/m3', 'MJ/kg', 'MJ/m3',
+    'MJ/m3', 'MJ/m3',
+    'mol%', 'mol%', 'ppmv', '-',
+    'kg/kg', 'C',
+)
+_PROPS_UNITS_US = (
+    'lb/lbmol', '-', 'lb/ft3',
+    'Btu/lb', 'Btu/scf', 'Btu/lb', 'Btu/scf',
+    'Btu/scf', 'Btu/scf',
+    'mol%', 'mol%', 'ppmv', '-',
+    'lb/lb', 'F',
+)
+
+@st.cache_data
+def build_results_frames(comp_tuple, si):
+    """Build the Results-tab frames once per (composition, units) pair"""
+    r = _calc_cached(comp_tuple)
+    d = convert_for_display(r, si)
+
+    x = r.x
+    order = r.order
+    mask = x[order] > 0
+    comp_df = pd.DataFrame({
+        'Component': COMP_NAMES_ARR[order][mask],
+        'Formula': COMP_FORMULAS[order][mask],
+        'Mol%': np.char.add(np.char.mod('%.2f', x[order][mask] * 100), '%'),
+    })
+
+    vals = np.array([
+        r.mw, r.sg, d['dens'],
+        d['lhv_m'], d['lhv_v'], d['hhv_m'], d['hhv_v'],
+        d['wi_l'], d['wi_h'],
+        r.h2, r.co2_n2, r.h2s, r.mn,
+        r.afr, d['aft'],
+    ])
+    props_df = pd.DataFrame({
+        'Property': _PROPS_LABELS,
+        'Value': np.char.mod(_PROPS_FMTS, vals),
+        'Unit': _PROPS_UNITS_SI if si else _PROPS_UNITS_US,
+    })
+    return comp_df, props_df
+
+def evaluate_limits(r, lims):
+    """Evaluate every active acceptance limit in one vectorized pass.
+
+    Returns ({lim_key: (value, status, min, max)}, all_ok).
+    """
+    active = [(lk, rk) for lk, rk in zip(CHECK_KEYS, RES_KEYS) if lk in lims]
+    vals = np.array([getattr(r, rk) for _, rk in active])
+    mins = np.array([lims[lk]['min'] for lk, _ in active])
+    maxs = np.array([lims[lk]['max'] for lk, _ in active])
+    ok = (vals >= mins) & (vals <= maxs)
+    checks = {
+        lk: (float(vals[i]), 'OK' if ok[i] else 'FAIL', float(mins[i]), float(maxs[i]))
+        for i, (lk, _) in enumerate(active)
+    }
+    return checks, bool(ok.all())
 
 # SIDEBAR
 with st.sidebar:
@@ -239,138 +592,92 @@ with tabs[0]:
     
     st.markdown("### Gas Composition")
     st.markdown("**Enter mol% for each component:**")
-    
-    col1, col2 = st.columns(2)
-    comp_input = {}
-    
-    components_list = list(COMPONENTS.items())
-    mid = len(components_list) // 2
-    
-    with col1:
-        for name, comp in components_list[:mid]:
-            # Get value from session state composition
-            comp_input[name] = st.number_input(
-                f"{name} ({comp.formula})",
-                min_value=0.0,
-                max_value=100.0,
-                value=float(st.session_state.composition.get(name, 0.0)),
-                step=0.1,
-                format="%.2f",
-                key=f"inp_{name}"
-            )
-            # Update session state as user types
-            st.session_state.composition[name] = comp_input[name]
-    
-    with col2:
-        for name, comp in components_list[mid:]:
-            # Get value from session state composition
-            comp_input[name] = st.number_input(
-                f"{name} ({comp.formula})",
-                min_value=0.0,
-                max_value=100.0,
-                value=float(st.session_state.composition.get(name, 0.0)),
-                step=0.1,
-                format="%.2f",
-                key=f"inp_{name}"
-            )
-            # Update session state as user types
-            st.session_state.composition[name] = comp_input[name]
-    
-    total = sum(comp_input.values())
+
+    editor_df = pd.DataFrame({
+        'Component': COMP_NAMES,
+        'Formula': COMP_FORMULAS,
+        'Mol%': st.session_state.composition,
+    })
+    # The form batches cell edits: the script reruns once on submit
+    # instead of once per edited cell
+    with st.form("composition_form"):
+        edited = st.data_editor(
+            editor_df,
+            num_rows="fixed",
+            column_config={
+                'Component': st.column_config.TextColumn(disabled=True),
+                'Formula': st.column_config.TextColumn(disabled=True),
+                'Mol%': st.column_config.NumberColumn(
+                    min_value=0.0, max_value=100.0, step=0.1, format="%.2f"
+                ),
+            },
+            hide_index=True,
+            use_container_width=True,
+            key="comp_editor"
+        )
+        submitted = st.form_submit_button(
+            "CALCULATE PROPERTIES", type="primary", use_container_width=True
+        )
+
+    comp_input = {
+        name: (0.0 if pd.isna(value) else float(value))
+        for name, value in zip(edited['Component'], edited['Mol%'])
+    }
+
+    # fsum: exact single-pass reduction, immune to mixed-scale rounding
+    # (e.g. 90 mol% methane alongside ppm-level H2S)
+    total = math.fsum(comp_input.values())
     if abs(total - 100) < 0.1:
         st.success(f"Total: {total:.2f}%")
     elif total > 0:
         st.warning(f"Total: {total:.2f}% (Should be 100%)")
-    
-    if st.button("CALCULATE PROPERTIES", type="primary", use_container_width=True):
-        results = calculate_properties(comp_input)
-        if results:
-            st.session_state.results = results
-            st.session_state.composition = comp_input
-            st.success("Calculation complete! Check Results tab.")
+
+    if submitted:
+        comp_hash = hash(tuple(sorted(comp_input.items())))
+        if comp_hash == st.session_state.get('comp_hash') and st.session_state.results:
+            st.success("Composition unchanged - results are up to date.")
         else:
-            st.error("Invalid composition")
+            results = calculate_properties(comp_input)
+            if results:
+                st.session_state.results = results
+                st.session_state.composition = np.fromiter(
+                    (comp_input[n] for n in COMP_NAMES),
+                    dtype=np.float64, count=N_COMP
+                )
+                st.session_state.comp_hash = comp_hash
+                st.session_state.comp_tuple = _comp_key(comp_input)
+                st.success("Calculation complete! Check Results tab.")
+            else:
+                st.error("Invalid composition")
 
 # TAB 2: RESULTS
 with tabs[1]:
     if not st.session_state.results:
         st.info("Enter composition and calculate first")
     else:
-        r = st.session_state.results
         si = st.session_state.use_si
-        
+        comp_tuple = st.session_state.get('comp_tuple') or _comp_key(
+            dict(zip(COMP_NAMES, st.session_state.composition))
+        )
+        comp_df, props_df = build_results_frames(comp_tuple, si)
+
         st.subheader("Gas Composition")
-        comp_df = pd.DataFrame([
-            {
-                'Component': name,
-                'Formula': COMPONENTS[name].formula,
-                'Mol%': f"{frac*100:.2f}%"
-            }
-            for name, frac in sorted(r['composition'].items(), 
-                                    key=lambda x: x[1], reverse=True)
-        ])
         st.dataframe(comp_df, use_container_width=True, hide_index=True)
-        
+
         st.subheader("Calculated Properties")
-        
-        props = [
-            ['Molecular Weight', f"{r['mw']:.3f}", 'g/mol' if si else 'lb/lbmol'],
-            ['Specific Gravity', f"{r['sg']:.4f}", '-'],
-            ['Density', f"{r['dens_si' if si else 'dens_us']:.4f}", 
-             'kg/m3' if si else 'lb/ft3'],
-            ['LHV (mass)', f"{r['lhv_m_si' if si else 'lhv_m_us']:.2f}", 
-             'MJ/kg' if si else 'Btu/lb'],
-            ['LHV (volume)', f"{r['lhv_v_si' if si else 'lhv_v_us']:.2f}", 
-             'MJ/m3' if si else 'Btu/scf'],
-            ['HHV (mass)', f"{r['hhv_m_si' if si else 'hhv_m_us']:.2f}", 
-             'MJ/kg' if si else 'Btu/lb'],
-            ['HHV (volume)', f"{r['hhv_v_si' if si else 'hhv_v_us']:.2f}", 
-             'MJ/m3' if si else 'Btu/scf'],
-            ['Wobbe Index (L)', f"{r['wi_l_si' if si else 'wi_l_us']:.2f}", 
-             'MJ/m3' if si else 'Btu/scf'],
-            ['Wobbe Index (H)', f"{r['wi_h_si' if si else 'wi_h_us']:.2f}", 
-             'MJ/m3' if si else 'Btu/scf'],
-            ['H2 Content', f"{r['h2']:.2f}", 'mol%'],
-            ['CO2+N2', f"{r['co2_n2']:.2f}", 'mol%'],
-            ['H2S', f"{r['h2s']:.1f}", 'ppmv'],
-            ['Methane Number', f"{r['mn']:.1f}", '-'],
-            ['Air/Fuel Ratio', f"{r['afr']:.2f}", 'kg/kg' if si else 'lb/lb'],
-            ['Flame Temp', f"{r['aft_c' if si else 'aft_f']:.0f}", 
-             'C' if si else 'F'],
-        ]
-        
-        props_df = pd.DataFrame(props, columns=['Property', 'Value', 'Unit'])
         st.dataframe(props_df, use_container_width=True, hide_index=True)
-        
-        if EXCEL_OK:
-            if st.button("Download Excel Report"):
-                output = io.BytesIO()
-                wb = Workbook()
-                ws = wb.active
-                ws['A1'] = "Gas Analysis Report"
-                ws['A1'].font = Font(bold=True, size=14)
-                
-                ws['A3'] = f"Project: {project}"
-                ws['A4'] = f"Date: {datetime.now().strftime('%Y-%m-%d')}"
-                
-                ws['A6'] = "Property"
-                ws['B6'] = "Value"
-                ws['C6'] = "Unit"
-                
-                for i, prop in enumerate(props, start=7):
-                    ws[f'A{i}'] = prop[0]
-                    ws[f'B{i}'] = prop[1]
-                    ws[f'C{i}'] = prop[2]
-                
-                wb.save(output)
-                output.seek(0)
-                
-                st.download_button(
-                    "Download Excel",
-                    output,
-                    f"gas_analysis_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+
+        if excel_ok():
+            props_tuple = tuple(map(tuple, props_df.itertuples(index=False)))
+            excel_bytes = _build_excel(
+                props_tuple, project, datetime.now().strftime('%Y-%m-%d')
+            )
+            st.download_button(
+                "Download Excel Report",
+                excel_bytes,
+                f"gas_analysis_{datetime.now().strftime('%Y%m%d')}.xlsx",
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
 
 # TAB 3: SUMMARY
 with tabs[2]:
@@ -379,24 +686,12 @@ with tabs[2]:
     else:
         r = st.session_state.results
         si = st.session_state.use_si
+        d = convert_for_display(r, si)
         lims = st.session_state.limits
         
-        checks = [
-            ('wobbe_lower', 'wi_l_si'),
-            ('lhv_vol', 'lhv_v_si'),
-            ('sg', 'sg'),
-            ('mn', 'mn'),
-            ('h2', 'h2'),
-            ('co2_n2', 'co2_n2')
-        ]
-        
-        statuses = []
-        for lim_key, res_key in checks:
-            if lim_key in lims:
-                status = check_status(lim_key, r[res_key], lims)
-                statuses.append(status)
-        
-        if 'FAIL' in statuses:
+        checks, all_ok = evaluate_limits(r, lims)
+
+        if not all_ok:
             st.error("NOT SUITABLE FOR TURBINE USE")
         else:
             st.success("SUITABLE FOR TURBINE USE")
@@ -405,55 +700,41 @@ with tabs[2]:
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Wobbe Index", 
-                     f"{r['wi_l_si' if si else 'wi_l_us']:.2f}")
-            st.metric("LHV", 
-                     f"{r['lhv_v_si' if si else 'lhv_v_us']:.2f}")
+            st.metric("Wobbe Index", f"{d['wi_l']:.2f}")
+            st.metric("LHV", f"{d['lhv_v']:.2f}")
         with col2:
-            st.metric("Specific Gravity", f"{r['sg']:.4f}")
-            st.metric("Methane Number", f"{r['mn']:.0f}")
+            st.metric("Specific Gravity", f"{r.sg:.4f}")
+            st.metric("Methane Number", f"{r.mn:.0f}")
         with col3:
-            st.metric("H2 Content", f"{r['h2']:.2f}%")
-            st.metric("Inerts", f"{r['co2_n2']:.2f}%")
+            st.metric("H2 Content", f"{r.h2:.2f}%")
+            st.metric("Inerts", f"{r.co2_n2:.2f}%")
         
         st.subheader("Detailed Assessment")
         
         status_data = []
-        for lim_key, res_key in checks:
-            if lim_key in lims:
-                lim = lims[lim_key]
-                
-                # Get value with proper unit conversion
-                if lim_key == 'wobbe_lower':
-                    val = r['wi_l_si'] if si else r['wi_l_us']
-                    check_val = r['wi_l_si']
-                    unit = 'MJ/m3' if si else 'Btu/scf'
-                    range_min = lim['min'] if si else lim['min'] * 26.839
-                    range_max = lim['max'] if si else lim['max'] * 26.839
-                elif lim_key == 'lhv_vol':
-                    val = r['lhv_v_si'] if si else r['lhv_v_us']
-                    check_val = r['lhv_v_si']
-                    unit = 'MJ/m3' if si else 'Btu/scf'
-                    range_min = lim['min'] if si else lim['min'] * 26.839
-                    range_max = lim['max'] if si else lim['max'] * 26.839
-                else:
-                    val = r[res_key]
-                    check_val = val
-                    unit = 'mol%' if lim_key in ['h2', 'co2_n2'] else ('-' if lim_key in ['sg', 'mn'] else 'ppmv')
-                    range_min = lim['min']
-                    range_max = lim['max']
-                
-                status = check_status(lim_key, check_val, lims)
-                
-                status_data.append({
-                    'Property': lim['name'],
-                    'Value': f"{val:.2f} {unit}",
-                    'Range': f"{range_min:.0f}-{range_max:.0f} {unit}",
-                    'Status': status
-                })
+        for lim_key, res_key in zip(CHECK_KEYS, RES_KEYS):
+            if lim_key not in checks:
+                continue
+            lim = lims[lim_key]
+
+            # Table-driven unit dispatch instead of per-key branches
+            disp_key, si_unit, us_unit, conv = UNIT_INFO[lim_key]
+            val = d[disp_key] if disp_key else getattr(r, res_key)
+            unit = si_unit if si else us_unit
+            range_min = lim['min'] if si else lim['min'] * conv
+            range_max = lim['max'] if si else lim['max'] * conv
+
+            status_data.append({
+                'Property': lim['name'],
+                'Value': f"{val:.2f} {unit}",
+                'Range': f"{range_min:.0f}-{range_max:.0f} {unit}",
+                'Status': checks[lim_key][1]
+            })
         
+        # st.dataframe takes the list of dicts directly; no need to build a
+        # DataFrame for a six-row static table on every rerun
         st.dataframe(
-            pd.DataFrame(status_data),
+            status_data,
             use_container_width=True,
             hide_index=True
         )
@@ -482,7 +763,7 @@ with tabs[3]:
         st.session_state.limits[key]['max'] = new_max
     
     if st.button("Reset to Defaults"):
-        st.session_state.limits = DEFAULT_LIMITS.copy()
+        st.session_state.limits = copy.deepcopy(DEFAULT_LIMITS)
         st.rerun()
 
 st.markdown("---")